@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime
 from decimal import Decimal
 
 from aiogram import F, Router
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 
@@ -15,12 +18,13 @@ from .keyboards import (
     start_menu_keyboard,
     year_keyboard,
 )
-from .services.calendar import CalendarError, CalendarService
-from .services.payroll import build_payroll, format_money, parse_salary, short_days_line
+from .services.calendar import TTL_SECONDS, CalendarError, CalendarResult, CalendarService
+from .services.payroll import PayrollResult, build_payroll, format_money, parse_salary, short_days_line
 from .states import PayrollStates
-from .storage.db import get_salary, set_salary
+from .storage.db import get_payroll, get_salary, get_salary_for_month, save_payroll, set_salary
 from .texts import (
     API_ERROR,
+    CALENDAR_LOADING,
     HELP_TEXT,
     MONTH_SELECT,
     MONTH_NAMES,
@@ -38,13 +42,24 @@ LOGGER = logging.getLogger(__name__)
 
 router = Router()
 
+# Calendar fetches faster than this are shown without an intermediate progress edit.
+PROGRESS_DELAY = 0.5
+
 
 def salary_format(value: int) -> str:
     return format_money(Decimal(value))
 
 
-async def show_main_menu(message: Message) -> None:
-    salary = await get_salary(message.from_user.id)
+async def edit_message(message: Message, text: str, **kwargs) -> None:
+    try:
+        await message.edit_text(text, **kwargs)
+    except TelegramBadRequest as exc:
+        if "message is not modified" not in str(exc):
+            raise
+
+
+async def show_main_menu(message: Message, user_id: int) -> None:
+    salary = await get_salary(user_id)
     if salary is None:
         await message.answer(START_NO_SALARY, parse_mode="Markdown")
     else:
@@ -55,16 +70,27 @@ async def show_main_menu(message: Message) -> None:
         )
 
 
-async def show_year_select(message: Message, state: FSMContext, year: int | None = None) -> None:
+async def show_year_select(
+    message: Message,
+    state: FSMContext,
+    year: int | None = None,
+    edit: bool = False,
+) -> None:
     year = year or datetime.now().year
     await state.set_state(PayrollStates.year)
     await state.update_data(year_view=year)
-    await message.answer(YEAR_SELECT, reply_markup=year_keyboard(year))
+    if edit:
+        await edit_message(message, YEAR_SELECT, reply_markup=year_keyboard(year))
+    else:
+        await message.answer(YEAR_SELECT, reply_markup=year_keyboard(year))
 
 
-async def show_month_select(message: Message, state: FSMContext) -> None:
+async def show_month_select(message: Message, state: FSMContext, edit: bool = False) -> None:
     await state.set_state(PayrollStates.month)
-    await message.answer(MONTH_SELECT, reply_markup=month_keyboard())
+    if edit:
+        await edit_message(message, MONTH_SELECT, reply_markup=month_keyboard())
+    else:
+        await message.answer(MONTH_SELECT, reply_markup=month_keyboard())
 
 
 @router.message(F.text == "/start")
@@ -134,6 +160,7 @@ async def salary_input(message: Message, state: FSMContext) -> None:
 
 @router.callback_query(F.data.startswith("year:"))
 async def year_callbacks(callback: CallbackQuery, state: FSMContext) -> None:
+    await callback.answer()
     action = callback.data.split(":", maxsplit=2)
     data = await state.get_data()
     year_view = int(data.get("year_view", datetime.now().year))
@@ -141,23 +168,21 @@ async def year_callbacks(callback: CallbackQuery, state: FSMContext) -> None:
     if action[1] == "prev":
         year_view -= 1
         await state.update_data(year_view=year_view)
-        await callback.message.edit_text(YEAR_SELECT, reply_markup=year_keyboard(year_view))
+        await edit_message(callback.message, YEAR_SELECT, reply_markup=year_keyboard(year_view))
     elif action[1] == "next":
         year_view += 1
         await state.update_data(year_view=year_view)
-        await callback.message.edit_text(YEAR_SELECT, reply_markup=year_keyboard(year_view))
+        await edit_message(callback.message, YEAR_SELECT, reply_markup=year_keyboard(year_view))
     elif action[1] == "choose" and len(action) == 3:
         year = int(action[2])
         await state.update_data(year=year)
-        await callback.message.edit_text(YEAR_SELECT)
-        await show_month_select(callback.message, state)
+        await show_month_select(callback.message, state, edit=True)
     elif action[1] == "manual":
         await state.set_state(PayrollStates.year_manual)
-        await callback.message.answer(YEAR_MANUAL_PROMPT, parse_mode="Markdown")
+        await edit_message(callback.message, YEAR_MANUAL_PROMPT, parse_mode="Markdown")
     elif action[1] == "back":
         await state.clear()
-        await show_main_menu(callback.message)
-    await callback.answer()
+        await show_main_menu(callback.message, callback.from_user.id)
 
 
 @router.message(PayrollStates.year_manual)
@@ -180,15 +205,21 @@ async def month_selected(
     state: FSMContext,
     calendar: CalendarService,
 ) -> None:
+    await callback.answer()
     month = int(callback.data.split(":", maxsplit=1)[1])
     data = await state.get_data()
     year = data.get("year")
     if not year:
-        await show_year_select(callback.message, state)
-        await callback.answer()
+        await show_year_select(callback.message, state, edit=True)
         return
-    await calculate_and_show(callback.message, state, calendar, year=year, month=month)
-    await callback.answer()
+    await calculate_and_show(
+        callback.message,
+        state,
+        calendar,
+        user_id=callback.from_user.id,
+        year=year,
+        month=month,
+    )
 
 
 @router.callback_query(F.data == "api:retry")
@@ -197,40 +228,97 @@ async def api_retry(
     state: FSMContext,
     calendar: CalendarService,
 ) -> None:
+    await callback.answer()
     data = await state.get_data()
     year = data.get("pending_year")
     month = data.get("pending_month")
     if year and month:
-        await calculate_and_show(callback.message, state, calendar, year=year, month=month)
-    await callback.answer()
+        await calculate_and_show(
+            callback.message,
+            state,
+            calendar,
+            user_id=callback.from_user.id,
+            year=year,
+            month=month,
+        )
 
 
 @router.callback_query(F.data == "api:back")
 async def api_back(callback: CallbackQuery, state: FSMContext) -> None:
-    await show_month_select(callback.message, state)
     await callback.answer()
+    await show_month_select(callback.message, state, edit=True)
+
+
+@router.callback_query(F.data == "result:other")
+async def result_other_month(callback: CallbackQuery, state: FSMContext) -> None:
+    await callback.answer()
+    data = await state.get_data()
+    await show_year_select(callback.message, state, year=data.get("year"), edit=True)
+
+
+@router.callback_query(F.data == "result:salary")
+async def result_change_salary(callback: CallbackQuery, state: FSMContext) -> None:
+    await callback.answer()
+    await state.set_state(PayrollStates.salary)
+    await edit_message(callback.message, SALARY_PROMPT, parse_mode="Markdown")
+
+
+@router.callback_query(F.data == "result:details")
+async def result_details(callback: CallbackQuery, state: FSMContext) -> None:
+    await callback.answer()
+    await send_details(callback.message, await state.get_data())
+
+
+async def fetch_calendar(
+    message: Message,
+    calendar: CalendarService,
+    year: int,
+    month: int,
+) -> CalendarResult:
+    task = asyncio.ensure_future(calendar.get_month_result(year, month))
+    done, _ = await asyncio.wait({task}, timeout=PROGRESS_DELAY)
+    if not done:
+        try:
+            await edit_message(message, CALENDAR_LOADING)
+        except TelegramAPIError as exc:
+            LOGGER.warning("Failed to show calendar progress: %s", exc)
+    return await task
 
 
 async def calculate_and_show(
     message: Message,
     state: FSMContext,
     calendar: CalendarService,
+    user_id: int,
     year: int,
     month: int,
 ) -> None:
-    salary = await get_salary(message.from_user.id)
-    if salary is None:
-        await state.set_state(PayrollStates.salary)
-        await message.answer(START_NO_SALARY, parse_mode="Markdown")
-        return
-    try:
-        calendar_raw = await calendar.get_month(year, month)
-    except CalendarError:
-        await state.update_data(pending_year=year, pending_month=month)
-        await message.answer(API_ERROR, reply_markup=api_error_keyboard())
-        return
+    row = await get_payroll(user_id, year, month, fetched_after=time.time() - TTL_SECONDS)
+    if row is not None:
+        payroll = PayrollResult.from_row(row)
+    else:
+        salary = await get_salary_for_month(user_id, year, month)
+        if salary is None:
+            await state.set_state(PayrollStates.salary)
+            await edit_message(message, START_NO_SALARY, parse_mode="Markdown")
+            return
+        try:
+            calendar_result = await fetch_calendar(message, calendar, year, month)
+        except CalendarError:
+            await state.update_data(pending_year=year, pending_month=month)
+            await edit_message(message, API_ERROR, reply_markup=api_error_keyboard())
+            return
+        payroll = build_payroll(year, month, salary, calendar_result.raw)
+        await save_payroll(
+            user_id,
+            year,
+            month,
+            salary,
+            calendar_result.raw,
+            calendar_result.fetched_at,
+            payroll.to_row(),
+        )
 
-    payroll = build_payroll(year, month, salary, calendar_raw)
     await state.update_data(
         year=year,
         month=month,
@@ -242,7 +330,7 @@ async def calculate_and_show(
 
     result_text = (
         f"**{payroll.month_name} {year}**\n"
-        f"Оклад: **{salary_format(salary)} ₽**\n\n"
+        f"Оклад: **{salary_format(payroll.salary)} ₽**\n\n"
         f"Норма рабочих часов: **{payroll.hours_total} ч**\n"
         f"• 1–15: **{payroll.hours_1_15} ч**\n"
         f"• 16–{payroll.last_day}: **{payroll.hours_16_end} ч**\n\n"
@@ -251,7 +339,7 @@ async def calculate_and_show(
         f"{short_days_line(payroll.short_days_count)}"
     )
 
-    await message.answer(result_text, reply_markup=result_keyboard(), parse_mode="Markdown")
+    await edit_message(message, result_text, reply_markup=result_keyboard(), parse_mode="Markdown")
 
 
 async def send_details(message: Message, data: dict) -> None:
@@ -44,14 +44,13 @@ def month_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def result_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="📅 Другой месяц")],
-            [KeyboardButton(text="✏️ Изменить оклад")],
-            [KeyboardButton(text="📋 Детали по дням")],
-        ],
-        resize_keyboard=True,
+def result_keyboard() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="📅 Другой месяц", callback_data="result:other")],
+            [InlineKeyboardButton(text="✏️ Изменить оклад", callback_data="result:salary")],
+            [InlineKeyboardButton(text="📋 Детали по дням", callback_data="result:details")],
+        ]
     )
 
 
@@ -35,18 +35,19 @@ class CalendarService:
             await self._session.close()
             self._session = None
 
-    async def get_month(self, year: int, month: int) -> str:
+    async def get_month_result(self, year: int, month: int) -> CalendarResult:
         await self.start()
         key = (year, month)
         now = time.time()
         async with self._lock:
             cached = self._cache.get(key)
             if cached and now - cached.fetched_at < TTL_SECONDS:
-                return cached.raw
+                return cached
         raw = await self._fetch_month(year, month)
+        result = CalendarResult(raw=raw, fetched_at=now)
         async with self._lock:
-            self._cache[key] = CalendarResult(raw=raw, fetched_at=now)
-        return raw
+            self._cache[key] = result
+        return result
 
     async def _fetch_month(self, year: int, month: int) -> str:
         if not self._session:
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
 
@@ -24,6 +25,7 @@ class PayrollResult:
     month: int
     month_name: str
     last_day: int
+    salary: int
     hours_total: int
     hours_1_15: int
     hours_16_end: int
@@ -32,6 +34,17 @@ class PayrollResult:
     short_days_count: int
     details: list[DayInfo]
 
+    def to_row(self) -> str:
+        return json.dumps(asdict(self), default=str, ensure_ascii=False)
+
+    @classmethod
+    def from_row(cls, row: str) -> PayrollResult:
+        data = json.loads(row)
+        data["advance"] = Decimal(data["advance"])
+        data["salary2"] = Decimal(data["salary2"])
+        data["details"] = [DayInfo(**detail) for detail in data["details"]]
+        return cls(**data)
+
 
 def parse_salary(text: str) -> int | None:
     cleaned = text.strip().replace("\xa0", " ")
@@ -98,6 +111,7 @@ def build_payroll(year: int, month: int, salary: int, calendar_raw: str) -> Payr
         month=month,
         month_name=MONTH_NAMES[month - 1],
         last_day=last_day,
+        salary=salary,
         hours_total=hours_total,
         hours_1_15=hours_1_15,
         hours_16_end=hours_16_end,
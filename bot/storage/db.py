@@ -1,9 +1,28 @@
 from __future__ import annotations
 
+from datetime import date
+
 import aiosqlite
 
 DB_PATH = "bot.db"
 
+# Salary in effect for a month; months before the first recorded salary use
+# the earliest known one.
+SALARY_FOR_MONTH_SQL = """
+    COALESCE(
+        (SELECT salary FROM salary_history
+         WHERE user_id = :user_id AND effective_from <= :period
+         ORDER BY effective_from DESC LIMIT 1),
+        (SELECT salary FROM salary_history
+         WHERE user_id = :user_id
+         ORDER BY effective_from ASC LIMIT 1)
+    )
+"""
+
+
+def month_start(year: int, month: int) -> str:
+    return date(year, month, 1).isoformat()
+
 
 async def init_db() -> None:
     async with aiosqlite.connect(DB_PATH) as db:
@@ -15,6 +34,40 @@ async def init_db() -> None:
             )
             """
         )
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS salary_history (
+                user_id INTEGER NOT NULL,
+                effective_from TEXT NOT NULL,
+                salary INTEGER NOT NULL,
+                PRIMARY KEY (user_id, effective_from)
+            )
+            """
+        )
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS payroll_result (
+                user_id INTEGER NOT NULL,
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                calendar_raw TEXT NOT NULL,
+                calendar_fetched_at REAL NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (user_id, year, month)
+            )
+            """
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS payroll_result_period ON payroll_result (year, month)"
+        )
+        # Salaries stored before the history table existed become its first entry.
+        today = date.today()
+        await db.execute(
+            "INSERT OR IGNORE INTO salary_history (user_id, effective_from, salary)"
+            " SELECT user_id, ?, salary FROM user_salary"
+            " WHERE user_id NOT IN (SELECT user_id FROM salary_history)",
+            (month_start(today.year, today.month),),
+        )
         await db.commit()
 
 
@@ -30,11 +83,90 @@ async def get_salary(user_id: int) -> int | None:
     return None
 
 
+async def get_salary_for_month(user_id: int, year: int, month: int) -> int | None:
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            f"SELECT {SALARY_FOR_MONTH_SQL}",
+            {"user_id": user_id, "period": month_start(year, month)},
+        ) as cursor:
+            row = await cursor.fetchone()
+    if row and row[0] is not None:
+        return int(row[0])
+    return None
+
+
 async def set_salary(user_id: int, salary: int) -> None:
+    today = date.today()
+    effective_key = month_start(today.year, today.month)
     async with aiosqlite.connect(DB_PATH) as db:
         await db.execute(
             "INSERT INTO user_salary (user_id, salary) VALUES (?, ?)"
             " ON CONFLICT(user_id) DO UPDATE SET salary = excluded.salary",
             (user_id, salary),
         )
+        await db.execute(
+            "INSERT INTO salary_history (user_id, effective_from, salary) VALUES (?, ?, ?)"
+            " ON CONFLICT(user_id, effective_from) DO UPDATE SET salary = excluded.salary",
+            (user_id, effective_key, salary),
+        )
+        async with db.execute(
+            "SELECT 1 FROM salary_history WHERE user_id = ? AND effective_from < ? LIMIT 1",
+            (user_id, effective_key),
+        ) as cursor:
+            has_earlier = await cursor.fetchone() is not None
+        if has_earlier:
+            await db.execute(
+                "DELETE FROM payroll_result WHERE user_id = ? AND year * 12 + month >= ?",
+                (user_id, today.year * 12 + today.month),
+            )
+        else:
+            await db.execute("DELETE FROM payroll_result WHERE user_id = ?", (user_id,))
+        await db.commit()
+
+
+async def get_payroll(user_id: int, year: int, month: int, fetched_after: float) -> str | None:
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT result FROM payroll_result"
+            " WHERE user_id = ? AND year = ? AND month = ? AND calendar_fetched_at >= ?",
+            (user_id, year, month, fetched_after),
+        ) as cursor:
+            row = await cursor.fetchone()
+    if row:
+        return row[0]
+    return None
+
+
+async def save_payroll(
+    user_id: int,
+    year: int,
+    month: int,
+    salary: int,
+    calendar_raw: str,
+    calendar_fetched_at: float,
+    result: str,
+) -> None:
+    async with aiosqlite.connect(DB_PATH) as db:
+        # Results computed from a different calendar for this month are stale for every user.
+        await db.execute(
+            "DELETE FROM payroll_result WHERE year = ? AND month = ? AND calendar_raw != ?",
+            (year, month, calendar_raw),
+        )
+        # Skip the insert if the salary changed while the result was being computed.
+        await db.execute(
+            "INSERT OR REPLACE INTO payroll_result"
+            " (user_id, year, month, calendar_raw, calendar_fetched_at, result)"
+            " SELECT :user_id, :year, :month, :calendar_raw, :calendar_fetched_at, :result"
+            f" WHERE {SALARY_FOR_MONTH_SQL} = :salary",
+            {
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "period": month_start(year, month),
+                "salary": salary,
+                "calendar_raw": calendar_raw,
+                "calendar_fetched_at": calendar_fetched_at,
+                "result": result,
+            },
+        )
         await db.commit()
@@ -36,6 +36,8 @@ YEAR_ERROR = "Год должен быть в диапазоне **2000–2100**
 
 MONTH_SELECT = "Отлично. Теперь выбери месяц:"
 
+CALENDAR_LOADING = "Загружаю производственный календарь… ⏳"
+
 API_ERROR = (
     "Не смог получить производственный календарь 😕\n"
     "Попробуй ещё раз через минуту.\n"